@@ -1,11 +1,15 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from startup_timer import startup_timer
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any
 import asyncio
 from event_emitter import emitter
 from database_manager import DatabaseManager
+from circuit_breaker import CircuitBreaker
+from snapshot_cache import SnapshotCache
 import os
 
 app = FastAPI(title="Incident Handler Dashboard")
@@ -19,14 +23,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database manager instance
+# Database manager instance (connects on first request)
 db_manager = DatabaseManager()
 
+def build_health() -> Dict[str, Any]:
+    """Collect system health, including the ServiceNow circuit state"""
+    # Breaker state is written by main.py runs, so reload it on every check
+    circuit = CircuitBreaker.from_settings("servicenow", store=db_manager).snapshot()
+    return {
+        "status": "degraded" if circuit["state"] == CircuitBreaker.OPEN else "healthy",
+        "database_mode": "postgres" if not db_manager.use_memory else "memory",
+        "active_connections": len(emitter.active_connections),
+        "servicenow_circuit": circuit,
+        "retry_queue_depth": db_manager.count_pending_retries()
+    }
+
+def build_snapshot() -> Dict[str, Any]:
+    """Collect everything the dashboard needs on load"""
+    return jsonable_encoder({
+        "history": db_manager.get_processing_history(100),
+        "statistics": db_manager.get_statistics(),
+        "health": build_health()
+    })
+
+def snapshot_change_token() -> tuple:
+    """Cheap check for changes, including writes from separate main.py runs"""
+    return (db_manager.get_change_token(), len(emitter.active_connections))
+
+# Dashboard snapshot cache, invalidated by processing events or a change token
+snapshot_cache = SnapshotCache(build_snapshot, snapshot_change_token)
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values"""
+    wildcard_q = None
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.strip().lower()
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard_q = q
+    return wildcard_q is not None and wildcard_q > 0
+
+def invalidate_snapshot(event_type: str, data: Dict[str, Any]):
+    """Drop the cached snapshot when processing state changes"""
+    if event_type != "connection":
+        snapshot_cache.invalidate()
+
+emitter.subscribe(invalidate_snapshot)
+startup_timer.mark("imports and app setup")
+
 @app.on_event("startup")
 async def startup_event():
     """Set event loop on startup"""
     loop = asyncio.get_event_loop()
     emitter.set_event_loop(loop)
+    startup_timer.mark("server startup")
+    startup_timer.report("Dashboard startup")
 
 @app.get("/")
 async def read_root():
@@ -62,12 +123,27 @@ async def get_statistics() -> Dict[str, Any]:
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "database_mode": "postgres" if not db_manager.use_memory else "memory",
-        "active_connections": len(emitter.active_connections)
+    return build_health()
+
+@app.get("/api/snapshot")
+async def get_snapshot(request: Request):
+    """Get history, statistics and health together, with ETag revalidation and gzip"""
+    snapshot = snapshot_cache.get()
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
     }
 
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return Response(snapshot.gzip_body, media_type="application/json", headers=headers)
+
+    return Response(snapshot.body, media_type="application/json", headers=headers)
+
 # Mount static files
 if os.path.exists("frontend"):
     app.mount("/static", StaticFiles(directory="frontend"), name="static")
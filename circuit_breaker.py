@@ -0,0 +1,162 @@
+import time
+import requests
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+from config import get_resilience_settings
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+def is_service_failure(error: Exception) -> bool:
+    """Whether an error means the service itself is unhealthy.
+
+    Connection errors, timeouts and 5xx/429 responses count; other 4xx responses are
+    problems with a single request and leave the circuit alone.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return False
+
+class CircuitBreaker:
+    """Trips after consecutive failures or slow calls and rejects calls until the reset timeout passes.
+
+    When a store (e.g. DatabaseManager) is given, state is loaded from and saved to it so
+    short-lived runs and the dashboard share the same view of the downstream service.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3,
+                 latency_threshold: float = 10.0, reset_timeout: float = 300.0,
+                 store=None, is_failure: Callable[[Exception], bool] = is_service_failure):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.store = store
+        self.is_failure = is_failure
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._loaded = store is None
+
+    @classmethod
+    def from_settings(cls, name: str, store=None) -> "CircuitBreaker":
+        """Create a breaker using the thresholds from the environment"""
+        settings = get_resilience_settings()
+        return cls(
+            name,
+            failure_threshold=settings.failure_threshold,
+            latency_threshold=settings.latency_threshold,
+            reset_timeout=settings.reset_timeout,
+            store=store
+        )
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, raising CircuitOpenError if it is open"""
+        if not self.allow_request():
+            raise CircuitOpenError(
+                f"Circuit '{self.name}' is open: {self.last_error or 'service unavailable'}"
+            )
+
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure(str(e))
+            else:
+                # The service answered; the error is specific to this request
+                self._record_response(started)
+            raise
+
+        self._record_response(started)
+        return result
+
+    def _record_response(self, started: float):
+        """Record a call the service answered, counting it as a failure if it was too slow"""
+        elapsed = time.monotonic() - started
+        if elapsed > self.latency_threshold:
+            self.record_failure(f"Slow response ({elapsed:.1f}s)")
+        else:
+            self.record_success()
+
+    def allow_request(self) -> bool:
+        """Whether a call may go through, moving to half-open once the reset timeout passes"""
+        self._load()
+        if self.state == self.OPEN:
+            if self.opened_at is not None and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._save()
+                return True
+            return False
+        return True
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        changed = self.state != self.CLOSED or self.consecutive_failures
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        if changed:
+            self._save()
+
+    def record_failure(self, error: str):
+        """Count a failure, opening the circuit when the threshold is reached"""
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                print(f"⚠️  Circuit '{self.name}' opened: {error}")
+            self.state = self.OPEN
+            self.opened_at = time.time()
+        self._save()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state as a serializable dict"""
+        self._load()
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_at": datetime.fromtimestamp(self.opened_at).isoformat() if self.opened_at else None,
+            "last_error": self.last_error
+        }
+
+    def _load(self):
+        """Load persisted state from the store on first use"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            saved = self.store.get_breaker_state(self.name)
+        except Exception as e:
+            print(f"⚠️  Could not load circuit state: {e}")
+            return
+        if saved:
+            self.state = saved["state"]
+            self.consecutive_failures = saved["consecutive_failures"]
+            self.opened_at = saved["opened_at"].timestamp() if saved.get("opened_at") else None
+            self.last_error = saved.get("last_error")
+
+    def _save(self):
+        """Persist state to the store, if any"""
+        if self.store is None:
+            return
+        try:
+            self.store.save_breaker_state(
+                self.name,
+                self.state,
+                self.consecutive_failures,
+                datetime.fromtimestamp(self.opened_at) if self.opened_at else None,
+                self.last_error
+            )
+        except Exception as e:
+            print(f"⚠️  Could not save circuit state: {e}")
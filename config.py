@@ -1,23 +1,87 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 
-load_dotenv()
 
-# ServiceNow
-SN_url = os.getenv("SN_url")
-SN_username = os.getenv("SN_username")
-SN_password = os.getenv("SN_password")
-ASSIGNMENT_GROUP_SYS_ID = os.getenv("ASSIGNMENT_GROUP_SYS_ID")
+@dataclass(frozen=True)
+class ServiceNowSettings:
+    """ServiceNow connection settings"""
+    url: str
+    username: str
+    password: str
+    assignment_group_sys_id: str
 
-# Postgres
-PG_HOST = os.getenv("PG_HOST")
-PG_PORT = os.getenv("PG_PORT", "5432")
-PG_DB = os.getenv("PG_DB")
-PG_USER = os.getenv("PG_USER")
-PG_PASSWORD = os.getenv("PG_PASSWORD")
 
-# Validate only ServiceNow credentials (database is optional for dashboard)
-sn_required = [SN_url, SN_username, SN_password, ASSIGNMENT_GROUP_SYS_ID]
+@dataclass(frozen=True)
+class PostgresSettings:
+    """Postgres connection settings (unset values fall back to libpq defaults)"""
+    host: Optional[str]
+    port: str
+    db: Optional[str]
+    user: Optional[str]
+    password: Optional[str]
+
+
+@dataclass(frozen=True)
+class ResilienceSettings:
+    """Circuit breaker and retry queue tuning for ServiceNow calls"""
+    failure_threshold: int
+    latency_threshold: float
+    reset_timeout: float
+    retry_base_delay: float
+    retry_max_delay: float
+    retry_max_attempts: int
+
+
+@lru_cache(maxsize=None)
+def _load_env():
+    """Load the .env file once, on first settings access"""
+    load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def get_servicenow_settings() -> ServiceNowSettings:
+    """Load and validate ServiceNow settings (only needed by the automation)"""
+    _load_env()
+    settings = ServiceNowSettings(
+        url=os.getenv("SN_url"),
+        username=os.getenv("SN_username"),
+        password=os.getenv("SN_password"),
+        assignment_group_sys_id=os.getenv("ASSIGNMENT_GROUP_SYS_ID"),
+    )
+
+    if not all([settings.url, settings.username, settings.password,
+                settings.assignment_group_sys_id]):
+        raise EnvironmentError("Missing required ServiceNow environment variables")
+
+    return settings
+
+
+@lru_cache(maxsize=None)
+def get_postgres_settings() -> PostgresSettings:
+    """Load Postgres settings (database is optional for dashboard)"""
+    _load_env()
+    return PostgresSettings(
+        host=os.getenv("PG_HOST"),
+        port=os.getenv("PG_PORT", "5432"),
+        db=os.getenv("PG_DB"),
+        user=os.getenv("PG_USER"),
+        password=os.getenv("PG_PASSWORD"),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_resilience_settings() -> ResilienceSettings:
+    """Load circuit breaker and retry settings, with defaults"""
+    _load_env()
+    return ResilienceSettings(
+        failure_threshold=int(os.getenv("SN_BREAKER_FAILURE_THRESHOLD", "3")),
+        latency_threshold=float(os.getenv("SN_BREAKER_LATENCY_SECONDS", "10")),
+        reset_timeout=float(os.getenv("SN_BREAKER_RESET_SECONDS", "300")),
+        retry_base_delay=float(os.getenv("RETRY_BASE_DELAY_SECONDS", "60")),
+        retry_max_delay=float(os.getenv("RETRY_MAX_DELAY_SECONDS", "3600")),
+        retry_max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "10")),
+    )
 
-if not all(sn_required):
-    raise EnvironmentError("Missing required ServiceNow environment variables")
@@ -1,39 +1,70 @@
 import psycopg2
 import psycopg2.extras
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-from config import PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASSWORD
+from config import get_postgres_settings
 import uuid
 
+# Bump whenever the DDL in _ensure_tables_exist changes
+SCHEMA_VERSION = 2
+
 class DatabaseManager:
     """Manages database operations for execution logging and history"""
     
+    # Set once the schema has been verified in this process
+    _schema_ready = False
+    
     def __init__(self):
         self.conn = None
-        self.use_memory = False
+        self._use_memory = None
         self.memory_logs = []
         self.memory_history = []
-        
+        self.memory_breakers = {}
+        self.memory_retries = []
+        self._next_retry_id = 1
+    
+    @property
+    def use_memory(self) -> bool:
+        """Whether in-memory storage is used; connects on first access"""
+        if self._use_memory is None:
+            self._connect()
+        return self._use_memory
+    
+    def _connect(self):
+        """Open the database connection, falling back to in-memory storage"""
+        settings = get_postgres_settings()
         try:
             self.conn = psycopg2.connect(
-                host=PG_HOST,
-                port=PG_PORT,
-                dbname=PG_DB,
-                user=PG_USER,
-                password=PG_PASSWORD
+                host=settings.host,
+                port=settings.port,
+                dbname=settings.db,
+                user=settings.user,
+                password=settings.password
             )
             self.conn.autocommit = True
             self._ensure_tables_exist()
+            self._use_memory = False
             print("✓ Database connected successfully")
         except Exception as e:
             print(f"⚠️  Database connection failed: {e}")
             print("📝 Using in-memory storage (data will not persist)")
-            self.use_memory = True
+            self.conn = None
+            self._use_memory = True
     
     def _ensure_tables_exist(self):
-        """Create tables if they don't exist"""
+        """Create tables if the deployed schema is missing or out of date"""
+        if DatabaseManager._schema_ready:
+            return
+        
         with self.conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('schema_version')")
+            if cur.fetchone()[0] is not None:
+                cur.execute("SELECT MAX(version) FROM schema_version")
+                if (cur.fetchone()[0] or 0) >= SCHEMA_VERSION:
+                    DatabaseManager._schema_ready = True
+                    return
+            
             # Execution logs table
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS execution_logs (
@@ -77,6 +108,54 @@ class DatabaseManager:
                 CREATE INDEX IF NOT EXISTS idx_incident_history_processed_at 
                 ON incident_processing_history(processed_at DESC);
             """)
+            
+            # ServiceNow circuit breaker state, shared across runs and the dashboard
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS circuit_breaker_state (
+                    name VARCHAR(50) PRIMARY KEY,
+                    state VARCHAR(20) NOT NULL,
+                    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                    opened_at TIMESTAMP,
+                    last_error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            
+            # Resolutions deferred while ServiceNow is unavailable
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS resolution_retry_queue (
+                    id SERIAL PRIMARY KEY,
+                    incident_number VARCHAR(50) NOT NULL,
+                    incident_sys_id VARCHAR(100) NOT NULL UNIQUE,
+                    short_description TEXT,
+                    matched_rule_id INTEGER,
+                    payload JSONB NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_retry_queue_next_attempt_at 
+                ON resolution_retry_queue(next_attempt_at);
+            """)
+            
+            # Record the schema version so later starts skip the DDL
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            
+            cur.execute("""
+                INSERT INTO schema_version (version) VALUES (%s)
+                ON CONFLICT (version) DO NOTHING
+            """, (SCHEMA_VERSION,))
+        
+        DatabaseManager._schema_ready = True
     
     def log_event(self, execution_id: str, event_type: str, 
                   incident_number: Optional[str] = None,
@@ -234,6 +313,170 @@ class DatabaseManager:
                 }
             }
     
+    def get_breaker_state(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get persisted circuit breaker state"""
+        if self.use_memory:
+            return self.memory_breakers.get(name)
+            
+        with self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT * FROM circuit_breaker_state
+                WHERE name = %s
+            """, (name,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+    
+    def save_breaker_state(self, name: str, state: str, consecutive_failures: int,
+                           opened_at: Optional[datetime], last_error: Optional[str]):
+        """Persist circuit breaker state"""
+        if self.use_memory:
+            self.memory_breakers[name] = {
+                'name': name,
+                'state': state,
+                'consecutive_failures': consecutive_failures,
+                'opened_at': opened_at,
+                'last_error': last_error,
+                'updated_at': datetime.now()
+            }
+            return
+            
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO circuit_breaker_state
+                (name, state, consecutive_failures, opened_at, last_error, updated_at)
+                VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (name) DO UPDATE SET
+                    state = EXCLUDED.state,
+                    consecutive_failures = EXCLUDED.consecutive_failures,
+                    opened_at = EXCLUDED.opened_at,
+                    last_error = EXCLUDED.last_error,
+                    updated_at = EXCLUDED.updated_at
+            """, (name, state, consecutive_failures, opened_at, last_error))
+    
+    def enqueue_retry(self, incident_number: str, incident_sys_id: str,
+                      short_description: str, matched_rule_id: Optional[int],
+                      payload: Dict[str, Any], error_message: Optional[str] = None):
+        """Queue a resolution to retry once ServiceNow recovers"""
+        if self.use_memory:
+            if any(r['incident_sys_id'] == incident_sys_id for r in self.memory_retries):
+                return
+            self.memory_retries.append({
+                'id': self._next_retry_id,
+                'incident_number': incident_number,
+                'incident_sys_id': incident_sys_id,
+                'short_description': short_description,
+                'matched_rule_id': matched_rule_id,
+                'payload': payload,
+                'attempts': 0,
+                'next_attempt_at': datetime.now(),
+                'last_error': error_message
+            })
+            self._next_retry_id += 1
+            return
+            
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO resolution_retry_queue
+                (incident_number, incident_sys_id, short_description,
+                 matched_rule_id, payload, last_error)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (incident_sys_id) DO NOTHING
+            """, (
+                incident_number,
+                incident_sys_id,
+                short_description,
+                matched_rule_id,
+                json.dumps(payload),
+                error_message
+            ))
+    
+    def get_due_retries(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get queued resolutions whose backoff has elapsed"""
+        if self.use_memory:
+            now = datetime.now()
+            due = [r for r in self.memory_retries if r['next_attempt_at'] <= now]
+            return sorted(due, key=lambda x: x['next_attempt_at'])[:limit]
+            
+        with self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT * FROM resolution_retry_queue
+                WHERE next_attempt_at <= CURRENT_TIMESTAMP
+                ORDER BY next_attempt_at
+                LIMIT %s
+            """, (limit,))
+            return [dict(row) for row in cur.fetchall()]
+    
+    def reschedule_retry(self, retry_id: int, error_message: str, delay_seconds: float):
+        """Record a failed retry and push the next attempt back"""
+        if self.use_memory:
+            for r in self.memory_retries:
+                if r['id'] == retry_id:
+                    r['attempts'] += 1
+                    r['last_error'] = error_message
+                    r['next_attempt_at'] = datetime.now() + timedelta(seconds=delay_seconds)
+            return
+            
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE resolution_retry_queue
+                SET attempts = attempts + 1,
+                    last_error = %s,
+                    next_attempt_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+                WHERE id = %s
+            """, (error_message, delay_seconds, retry_id))
+    
+    def remove_retry(self, retry_id: int):
+        """Remove a resolution from the retry queue"""
+        if self.use_memory:
+            self.memory_retries = [r for r in self.memory_retries if r['id'] != retry_id]
+            return
+            
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM resolution_retry_queue WHERE id = %s", (retry_id,))
+    
+    def remove_retry_for_incident(self, incident_sys_id: str):
+        """Remove any queued resolution for an incident"""
+        if self.use_memory:
+            self.memory_retries = [
+                r for r in self.memory_retries if r['incident_sys_id'] != incident_sys_id
+            ]
+            return
+            
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM resolution_retry_queue WHERE incident_sys_id = %s
+            """, (incident_sys_id,))
+    
+    def count_pending_retries(self) -> int:
+        """Get the number of queued resolutions"""
+        if self.use_memory:
+            return len(self.memory_retries)
+            
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM resolution_retry_queue")
+            return cur.fetchone()[0]
+    
+    def get_change_token(self) -> tuple:
+        """Cheap fingerprint of everything the dashboard snapshot is built from"""
+        if self.use_memory:
+            updated = [b['updated_at'] for b in self.memory_breakers.values()]
+            return (
+                len(self.memory_history),
+                max(updated) if updated else None,
+                len(self.memory_retries),
+                datetime.now().date()
+            )
+            
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT
+                    (SELECT MAX(id) FROM incident_processing_history),
+                    (SELECT MAX(updated_at) FROM circuit_breaker_state),
+                    (SELECT COUNT(*) FROM resolution_retry_queue),
+                    CURRENT_DATE
+            """)
+            return tuple(cur.fetchone())
+    
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -1,7 +1,7 @@
 import json
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, Set
+from typing import Callable, Dict, Any, List, Set
 from fastapi import WebSocket
 
 class EventEmitter:
@@ -14,6 +14,7 @@ class EventEmitter:
             cls._instance = super().__new__(cls)
             cls._instance.active_connections: Set[WebSocket] = set()
             cls._instance.loop = None
+            cls._instance.listeners: List[Callable[[str, Dict[str, Any]], None]] = []
         return cls._instance
     
     def set_event_loop(self, loop):
@@ -30,7 +31,24 @@ class EventEmitter:
         """Remove a WebSocket connection"""
         self.active_connections.discard(websocket)
     
+    def subscribe(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register an in-process listener called with every emitted event"""
+        self.listeners.append(listener)
+    
+    def _notify_listeners(self, event_type: str, data: Dict[str, Any]):
+        """Call in-process listeners, ignoring their failures"""
+        for listener in self.listeners:
+            try:
+                listener(event_type, data)
+            except Exception as e:
+                print(f"⚠️  Event listener failed: {e}")
+    
     async def emit(self, event_type: str, data: Dict[str, Any]):
+        """Notify listeners and broadcast an event to all connected clients"""
+        self._notify_listeners(event_type, data)
+        await self._broadcast(event_type, data)
+    
+    async def _broadcast(self, event_type: str, data: Dict[str, Any]):
         """Broadcast an event to all connected clients"""
         if not self.active_connections:
             return
@@ -52,10 +70,11 @@ class EventEmitter:
         self.active_connections -= disconnected
     
     def emit_sync(self, event_type: str, data: Dict[str, Any]):
-        """Synchronous wrapper for emit - schedules the async emit"""
+        """Synchronous wrapper for emit - notifies listeners and schedules the async broadcast"""
+        self._notify_listeners(event_type, data)
         if self.loop and self.loop.is_running():
             asyncio.run_coroutine_threadsafe(
-                self.emit(event_type, data),
+                self._broadcast(event_type, data),
                 self.loop
             )
     
@@ -3,9 +3,13 @@ let ws = null;
 let reconnectInterval = null;
 const WS_URL = `ws://${window.location.host}/ws`;
 
+// ETag of the last dashboard snapshot, sent back as If-None-Match
+let snapshotEtag = null;
+
 // System state
 const systemState = {
     databaseMode: 'unknown', // 'postgres', 'memory', or 'unknown'
+    circuitState: 'unknown', // 'closed', 'open', 'half_open', or 'unknown'
     apiHealthy: true,
     lastHealthCheck: null
 };
@@ -19,7 +23,8 @@ const state = {
         failed: 0
     },
     incidents: new Map(),
-    history: []
+    history: [],
+    historyLoaded: false
 };
 
 // DOM Elements
@@ -45,17 +50,12 @@ const elements = {
 
 // Initialize
 function init() {
-    checkSystemHealth();
     connectWebSocket();
-    loadHistory();
-    loadStatistics();
+    loadSnapshot();
     setupEventListeners();
 
-    // Auto-refresh history every 30 seconds
-    setInterval(loadHistory, 30000);
-
-    // Health check every 60 seconds
-    setInterval(checkSystemHealth, 60000);
+    // Revalidate the snapshot every 30 seconds (unchanged snapshots return 304)
+    setInterval(loadSnapshot, 30000);
 }
 
 // WebSocket Connection
@@ -121,45 +121,35 @@ function updateConnectionStatus(connected) {
     }
 }
 
-// System Health Check
-async function checkSystemHealth() {
+// Dashboard Snapshot (history, statistics and health in one request)
+async function loadSnapshot() {
     try {
-        const response = await fetch('/api/health');
+        const headers = snapshotEtag ? { 'If-None-Match': snapshotEtag } : {};
+        const response = await fetch('/api/snapshot', { headers });
+
+        systemState.lastHealthCheck = new Date();
+
+        if (response.status === 304) {
+            systemState.apiHealthy = true;
+            return;
+        }
 
         if (!response.ok) {
-            throw new Error(`Health check failed: ${response.status}`);
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
 
-        const health = await response.json();
+        const snapshot = await response.json();
+        snapshotEtag = response.headers.get('ETag');
         systemState.apiHealthy = true;
-        systemState.lastHealthCheck = new Date();
 
-        // Check database mode
-        if (health.database_mode) {
-            const previousMode = systemState.databaseMode;
-            systemState.databaseMode = health.database_mode;
-
-            // Show banner if using in-memory mode
-            if (health.database_mode === 'memory' && previousMode !== 'memory') {
-                showSystemBanner(
-                    'warning',
-                    '⚠️ Running in In-Memory Mode: Database connection unavailable. Data will not persist after restart.',
-                    true
-                );
-                addLog('warning', 'System is using in-memory storage. Data will not persist.');
-            } else if (health.database_mode === 'postgres' && previousMode === 'memory') {
-                showSystemBanner(
-                    'success',
-                    '✓ Database Connected: System is now using PostgreSQL. Data will persist.',
-                    false
-                );
-                addLog('success', 'Database connection restored.');
-            }
-        }
+        applyHealth(snapshot.health);
+        applyHistory(snapshot.history);
+        applyStatistics(snapshot.statistics);
 
     } catch (error) {
-        console.error('Health check failed:', error);
+        console.error('Failed to load snapshot:', error);
         systemState.apiHealthy = false;
+        snapshotEtag = null;
 
         // Show error notification
         showNotification(
@@ -169,7 +159,60 @@ async function checkSystemHealth() {
             15000
         );
 
-        addLog('error', `Health check failed: ${error.message}`);
+        addLog('error', `Failed to load dashboard data: ${error.message}`);
+
+        // Show fallback UI only if there is no history to keep showing
+        if (!state.historyLoaded) {
+            renderHistoryError(error.message);
+        }
+    }
+}
+
+// System Health
+function applyHealth(health) {
+    // Check database mode
+    if (health.database_mode) {
+        const previousMode = systemState.databaseMode;
+        systemState.databaseMode = health.database_mode;
+
+        // Show banner if using in-memory mode
+        if (health.database_mode === 'memory' && previousMode !== 'memory') {
+            showSystemBanner(
+                'warning',
+                '⚠️ Running in In-Memory Mode: Database connection unavailable. Data will not persist after restart.',
+                true
+            );
+            addLog('warning', 'System is using in-memory storage. Data will not persist.');
+        } else if (health.database_mode === 'postgres' && previousMode === 'memory') {
+            showSystemBanner(
+                'success',
+                '✓ Database Connected: System is now using PostgreSQL. Data will persist.',
+                false
+            );
+            addLog('success', 'Database connection restored.');
+        }
+    }
+
+    // Check ServiceNow circuit breaker
+    if (health.servicenow_circuit) {
+        const previousState = systemState.circuitState;
+        systemState.circuitState = health.servicenow_circuit.state;
+
+        if (systemState.circuitState === 'open' && previousState !== 'open') {
+            showSystemBanner(
+                'warning',
+                `⚠️ ServiceNow Unavailable: Resolutions are queued for retry (${health.retry_queue_depth} pending).`,
+                true
+            );
+            addLog('warning', `ServiceNow circuit open: ${health.servicenow_circuit.last_error || 'service unavailable'}`);
+        } else if (systemState.circuitState !== 'open' && previousState === 'open') {
+            showSystemBanner(
+                'success',
+                '✓ ServiceNow Recovered: Queued resolutions will be retried on the next run.',
+                false
+            );
+            addLog('success', 'ServiceNow circuit closed.');
+        }
     }
 }
 
@@ -297,7 +340,7 @@ function handleIncidentResolved(data) {
     addLog('success', `✓ Resolved ${incident_number}`);
 
     // Reload history to show new entry
-    setTimeout(loadHistory, 1000);
+    setTimeout(loadSnapshot, 1000);
 }
 
 function handleIncidentSkipped(data) {
@@ -311,7 +354,7 @@ function handleIncidentSkipped(data) {
 
     addLog('warning', `⊘ Skipped ${incident_number}: ${reason}`);
 
-    setTimeout(loadHistory, 1000);
+    setTimeout(loadSnapshot, 1000);
 }
 
 function handleError(data) {
@@ -325,7 +368,7 @@ function handleError(data) {
 
     addLog('error', `✕ Error on ${incident_number}: ${error}`);
 
-    setTimeout(loadHistory, 1000);
+    setTimeout(loadSnapshot, 1000);
 }
 
 function handleExecutionCompleted(data) {
@@ -415,59 +458,19 @@ function addLog(level, message) {
     }
 }
 
-// API Calls with Error Handling
-async function loadHistory() {
-    try {
-        const response = await fetch('/api/history?limit=100');
-
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
-
-        const history = await response.json();
-        state.history = history;
-        renderHistory(history);
-
-    } catch (error) {
-        console.error('Failed to load history:', error);
-        addLog('error', 'Failed to load processing history');
-
-        // Show user-friendly error
-        showNotification(
-            'error',
-            'History Load Failed',
-            'Unable to load incident processing history. The data may be temporarily unavailable.',
-            8000
-        );
-
-        // Show fallback UI
-        renderHistoryError(error.message);
-    }
+// Snapshot Sections
+function applyHistory(history) {
+    state.history = history || [];
+    state.historyLoaded = true;
+    renderHistory(state.history);
 }
 
-async function loadStatistics() {
-    try {
-        const response = await fetch('/api/statistics');
-
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
-
-        const stats = await response.json();
-
-        if (stats.today) {
-            state.stats.success = stats.today.success || 0;
-            state.stats.skipped = stats.today.skipped || 0;
-            state.stats.failed = stats.today.failed || 0;
-            updateStats();
-        }
-
-    } catch (error) {
-        console.error('Failed to load statistics:', error);
-        addLog('warning', 'Statistics temporarily unavailable');
-
-        // Don't show notification for stats failure (less critical)
-        // Stats will show 0 which is acceptable fallback
+function applyStatistics(stats) {
+    if (stats && stats.today) {
+        state.stats.success = stats.today.success || 0;
+        state.stats.skipped = stats.today.skipped || 0;
+        state.stats.failed = stats.today.failed || 0;
+        updateStats();
     }
 }
 
@@ -496,7 +499,7 @@ function renderHistoryError(errorMessage) {
                     <div class="error-icon">⚠️</div>
                     <div class="error-title">Unable to Load History</div>
                     <div class="error-message">${errorMessage}</div>
-                    <button class="btn-retry" onclick="loadHistory()">↻ Retry</button>
+                    <button class="btn-retry" onclick="loadSnapshot()">↻ Retry</button>
                 </div>
             </td>
         </tr>
@@ -527,8 +530,9 @@ function setupEventListeners() {
     });
 
     elements.refreshHistory.addEventListener('click', () => {
-        loadHistory();
-        loadStatistics();
+        // Force a full reload rather than a 304
+        snapshotEtag = null;
+        loadSnapshot();
         addLog('info', 'History refreshed');
     });
 
@@ -1,20 +1,92 @@
+from startup_timer import startup_timer
 from servicenow_client import ServiceNowClient
 from rules_repository import RulesRepository
-from config import ASSIGNMENT_GROUP_SYS_ID
+from circuit_breaker import CircuitBreaker, CircuitOpenError, is_service_failure
+from config import get_servicenow_settings, get_resilience_settings
 from event_emitter import emitter
 from database_manager import DatabaseManager
 import uuid
 import asyncio
 
+def drain_retry_queue(sn, db_manager, execution_id, assignment_group_sys_id):
+    """Retry queued resolutions whose backoff has elapsed, stopping if the circuit opens"""
+    settings = get_resilience_settings()
+    resolved = 0
+
+    for item in db_manager.get_due_retries():
+        incident_number = item["incident_number"]
+
+        try:
+            # The incident may have been picked up, reopened or closed while queued
+            if not sn.is_incident_eligible(assignment_group_sys_id, item["incident_sys_id"]):
+                print(f"Dropped queued {incident_number} (no longer eligible)")
+                db_manager.remove_retry(item["id"])
+                db_manager.log_event(execution_id, "retry_dropped",
+                                    incident_number=incident_number,
+                                    message="Incident no longer eligible for resolution")
+                continue
+
+            sn.update_and_resolve_incident(item["incident_sys_id"], item["payload"])
+        except CircuitOpenError:
+            break
+        except Exception as e:
+            error_msg = str(e)
+            attempts = item["attempts"] + 1
+
+            if attempts >= settings.retry_max_attempts:
+                print(f"Giving up on queued {incident_number} after {attempts} attempts")
+                db_manager.remove_retry(item["id"])
+                db_manager.log_incident_processing(
+                    incident_number, item["incident_sys_id"], item["short_description"],
+                    item["matched_rule_id"], "failed", "failed", error_msg
+                )
+                continue
+
+            delay = min(settings.retry_base_delay * 2 ** item["attempts"], settings.retry_max_delay)
+            db_manager.reschedule_retry(item["id"], error_msg, delay)
+            continue
+
+        print(f"Resolved queued {incident_number} using SOP rule")
+        resolved += 1
+        db_manager.remove_retry(item["id"])
+
+        emitter.emit_sync("incident_resolved", {
+            "incident_number": incident_number,
+            "rule_id": str(item["matched_rule_id"])
+        })
+
+        db_manager.log_incident_processing(
+            incident_number, item["incident_sys_id"], item["short_description"],
+            item["matched_rule_id"], "resolved", "success"
+        )
+
+    if resolved:
+        db_manager.log_event(execution_id, "retry_queue_drained",
+                            message=f"Resolved {resolved} queued incidents")
+
 def process_incidents():
     """Process incidents with real-time event broadcasting and logging"""
+    startup_timer.mark("imports")
     execution_id = str(uuid.uuid4())
     db_manager = DatabaseManager()
     
-    sn = ServiceNowClient()
+    sn = ServiceNowClient(breaker=CircuitBreaker.from_settings("servicenow", store=db_manager))
     rules_repo = RulesRepository()
+    assignment_group_sys_id = get_servicenow_settings().assignment_group_sys_id
+    startup_timer.mark("settings and clients")
 
-    incidents = sn.fetch_eligible_incidents(ASSIGNMENT_GROUP_SYS_ID)
+    drain_retry_queue(sn, db_manager, execution_id, assignment_group_sys_id)
+    startup_timer.mark("drain retry queue")
+
+    try:
+        incidents = sn.fetch_eligible_incidents(assignment_group_sys_id)
+    except CircuitOpenError as e:
+        print(f"ServiceNow unavailable, skipping run: {e}")
+        db_manager.log_event(execution_id, "execution_skipped", message=str(e))
+        db_manager.close()
+        return
+    startup_timer.mark("fetch incidents")
+    startup_timer.report()
 
     if not incidents:
         print("No eligible incidents found")
@@ -27,7 +99,7 @@ def process_incidents():
     db_manager.log_event(execution_id, "execution_started", 
                         message=f"Processing {len(incidents)} incidents")
     
-    stats = {"success": 0, "failed": 0, "skipped": 0}
+    stats = {"success": 0, "failed": 0, "skipped": 0, "queued": 0}
 
     for inc in incidents:
         incident_number = inc.get("number", "UNKNOWN")
@@ -72,24 +144,27 @@ def process_incidents():
             }
         })
 
-        try:
-            payload = {
-                "state": "6",
-                "close_code": "Solved (Permanently)",
-                "close_notes": rule.get("closure_note"),
-                "work_notes": rule.get("work_notes"),
-                "u_jira_reference": rule.get("jira_reference"),
-                "parent_incident": rule.get("parent_incident"),
-                "u_kb_article": rule.get("kb_article")
-            }
+        payload = {
+            "state": "6",
+            "close_code": "Solved (Permanently)",
+            "close_notes": rule.get("closure_note"),
+            "work_notes": rule.get("work_notes"),
+            "u_jira_reference": rule.get("jira_reference"),
+            "parent_incident": rule.get("parent_incident"),
+            "u_kb_article": rule.get("kb_article")
+        }
 
-            # Remove empty fields
-            payload = {k: v for k, v in payload.items() if v}
+        # Remove empty fields
+        payload = {k: v for k, v in payload.items() if v}
 
+        try:
             sn.update_and_resolve_incident(sys_id, payload)
             print(f"Resolved {incident_number} using SOP rule")
             stats["success"] += 1
             
+            # Don't let a pending retry resolve it a second time
+            db_manager.remove_retry_for_incident(sys_id)
+            
             # Broadcast resolved
             emitter.emit_sync("incident_resolved", {
                 "incident_number": incident_number,
@@ -103,6 +178,19 @@ def process_incidents():
             
         except Exception as e:
             error_msg = str(e)
+            
+            if isinstance(e, CircuitOpenError) or is_service_failure(e):
+                # ServiceNow is down: defer to the retry queue instead of failing
+                stats["queued"] += 1
+                db_manager.enqueue_retry(
+                    incident_number, sys_id, short_desc, rule.get("id"), payload, error_msg
+                )
+                # History gets a single row once the drain resolves or gives up on it
+                db_manager.log_event(execution_id, "resolution_queued",
+                                    incident_number=incident_number,
+                                    message=error_msg)
+                continue
+            
             print(f"Failed to resolve {incident_number}: {error_msg}")
             stats["failed"] += 1
             
@@ -117,6 +205,9 @@ def process_incidents():
                 "failed", "failed", error_msg
             )
     
+    if stats["queued"]:
+        print(f"Queued {stats['queued']} resolutions until ServiceNow recovers")
+    
     # Broadcast execution completed
     emitter.emit_sync("execution_completed", {"stats": stats})
     db_manager.log_event(execution_id, "execution_completed",
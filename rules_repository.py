@@ -1,15 +1,23 @@
 import psycopg2
-from config import PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASSWORD
+from config import get_postgres_settings
 
 class RulesRepository:
     def __init__(self):
-        self.conn = psycopg2.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            dbname=PG_DB,
-            user=PG_USER,
-            password=PG_PASSWORD
-        )
+        self._conn = None
+
+    @property
+    def conn(self):
+        """Open the database connection on first use"""
+        if self._conn is None:
+            settings = get_postgres_settings()
+            self._conn = psycopg2.connect(
+                host=settings.host,
+                port=settings.port,
+                dbname=settings.db,
+                user=settings.user,
+                password=settings.password
+            )
+        return self._conn
 
     def find_matching_resolve_rule(self, short_desc, description):
         query = """
@@ -1,6 +1,7 @@
 import requests
 from requests.auth import HTTPBasicAuth
-from config import SN_url, SN_username, SN_password
+from config import get_servicenow_settings
+from circuit_breaker import CircuitBreaker
 
 HEADERS = {
     "Accept": "application/json",
@@ -8,17 +9,36 @@ HEADERS = {
 }
 
 class ServiceNowClient:
-    def __init__(self):
-        self.auth = HTTPBasicAuth(SN_username, SN_password)
-        self.incident_url = f"{SN_url}/api/now/table/incident"
+    def __init__(self, breaker=None):
+        settings = get_servicenow_settings()
+        self.breaker = breaker or CircuitBreaker.from_settings("servicenow")
+        self.auth = HTTPBasicAuth(settings.username, settings.password)
+        self.incident_url = f"{settings.url}/api/now/table/incident"
 
     def fetch_eligible_incidents(self, assignment_group_sys_id):
+        return self.breaker.call(self._fetch_eligible_incidents, assignment_group_sys_id)
+
+    def is_incident_eligible(self, assignment_group_sys_id, sys_id):
+        """Whether the incident still matches the eligibility filter (unassigned and open)"""
+        incidents = self.breaker.call(
+            self._fetch_eligible_incidents, assignment_group_sys_id, sys_id
+        )
+        return bool(incidents)
+
+    def update_and_resolve_incident(self, sys_id, payload):
+        return self.breaker.call(self._update_and_resolve_incident, sys_id, payload)
+
+    def _fetch_eligible_incidents(self, assignment_group_sys_id, sys_id=None):
+        query = (
+            f"assignment_group={assignment_group_sys_id}"
+            "^assigned_toISEMPTY"
+            "^stateNOT IN3,4,6,7"
+        )
+        if sys_id:
+            query += f"^sys_id={sys_id}"
+
         params = {
-            "sysparm_query": (
-                f"assignment_group={assignment_group_sys_id}"
-                "^assigned_toISEMPTY"
-                "^stateNOT IN3,4,6,7"
-            ),
+            "sysparm_query": query,
             "sysparm_fields": (
                 "sys_id,number,short_description,description,state"
             ),
@@ -35,7 +55,7 @@ class ServiceNowClient:
         response.raise_for_status()
         return response.json().get("result", [])
 
-    def update_and_resolve_incident(self, sys_id, payload):
+    def _update_and_resolve_incident(self, sys_id, payload):
         url = f"{self.incident_url}/{sys_id}"
         response = requests.patch(
             url,
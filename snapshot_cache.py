@@ -0,0 +1,59 @@
+import gzip
+import hashlib
+import json
+import threading
+from typing import Callable, Dict, Any, Optional
+
+class Snapshot:
+    """A serialized dashboard snapshot with its ETag and gzip-compressed body"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=6)
+        # Weak ETag: the same snapshot is served both plain and gzip-encoded
+        self.etag = f'W/"{hashlib.sha1(self.body).hexdigest()}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header value covers this snapshot"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags:
+            return True
+        bare = self.etag[2:]
+        return any(tag.removeprefix("W/") == bare for tag in tags)
+
+class SnapshotCache:
+    """Caches the dashboard snapshot until a processing event invalidates it or its change token moves.
+
+    The change token is a cheap query over the tables the snapshot reads, so writes from
+    other processes (e.g. cron-launched main.py), whose events never reach this
+    process's emitter, still trigger a rebuild.
+    """
+
+    def __init__(self, builder: Callable[[], Dict[str, Any]], change_token: Callable[[], Any]):
+        self.builder = builder
+        self.change_token = change_token
+        self._snapshot: Optional[Snapshot] = None
+        self._token: Any = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, *_):
+        """Drop the cached snapshot so the next request rebuilds it"""
+        self._generation += 1
+        self._snapshot = None
+
+    def get(self) -> Snapshot:
+        """Return the cached snapshot, rebuilding it if invalidated or the data changed"""
+        with self._lock:
+            token = self.change_token()
+            snapshot = self._snapshot
+            if snapshot is None or token != self._token:
+                generation = self._generation
+                snapshot = Snapshot(self.builder())
+                # Don't cache a snapshot that an event made stale while it was building
+                if generation == self._generation:
+                    self._snapshot = snapshot
+                    self._token = token
+            return snapshot
@@ -0,0 +1,29 @@
+import time
+from typing import List, Tuple
+
+class StartupTimer:
+    """Records elapsed time for each startup phase and prints a summary report"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.last_mark = self.started_at
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        """Record the time spent since the previous mark under the given phase name"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last_mark) * 1000))
+        self.last_mark = now
+
+    def total_ms(self) -> float:
+        """Total elapsed time since the timer was created"""
+        return (self.last_mark - self.started_at) * 1000
+
+    def report(self, title: str = "Startup"):
+        """Print the per-phase timing report"""
+        print(f"⏱️  {title} timing ({self.total_ms():.1f} ms total):")
+        for phase, elapsed_ms in self.phases:
+            print(f"  • {phase}: {elapsed_ms:.1f} ms")
+
+# Global instance, created on first import so it captures import time
+startup_timer = StartupTimer()